@@ -1,10 +1,15 @@
 """Module for ansi escape codes."""
 
+import re
 import sys
-from typing import Any, Literal, Union, Callable, Tuple, List, Dict
-from dataclasses import dataclass, field
+from typing import Any, Literal, Union, Callable, Tuple, List, Dict, Iterator, get_args
+from dataclasses import dataclass, field, FrozenInstanceError
 from random import choice
-from copy import copy, deepcopy
+from copy import copy
+from contextlib import contextmanager
+from fractions import Fraction
+from functools import lru_cache
+from shutil import get_terminal_size
 
 
 _colors = Literal[
@@ -31,11 +36,21 @@ _ansi_codes = {
     'white': 37, 'bright_white': 97,
 }
 
+# Escape codes resetting colors and styles, and styles only
+_reset_full = '\033[39;49;0m'
+_reset_styles = '\033[0m'
 
-@dataclass
+# Ready-made escape codes for named colors
+_fore_escapes = {name: f'\033[{code}m' for name, code in _ansi_codes.items()}
+_back_escapes = {name: f'\033[{code + 10}m' for name, code in _ansi_codes.items()}
+
+
+@dataclass(frozen=True)
 class RGB:
     """Class for setting RGB color."""
 
+    __slots__ = ('red', 'green', 'blue', '_fore_escape', '_back_escape')
+
     red: int
     green: int
     blue: int
@@ -43,6 +58,10 @@ class RGB:
     def __str__(self):
         return self.to_hex()
 
+    def __reduce__(self):
+        # Rebuild copies and pickles through the constructor, restoring slots would hit the frozen __setattr__
+        return (type(self), (self.red, self.green, self.blue))
+
     def __add__(self, other):
         """
         Add two RGB objects.
@@ -54,16 +73,32 @@ class RGB:
             - RGB: A new RGB object representing the average color between self and other.
         """
         if isinstance(other, RGB):
-            new_red = (self.red + other.red) / 2
-            new_green = (self.green + other.green) / 2
-            new_blue = (self.blue + other.blue) / 2
+            new_red = (self.red + other.red) >> 1
+            new_green = (self.green + other.green) >> 1
+            new_blue = (self.blue + other.blue) >> 1
             return RGB(new_red, new_green, new_blue)
         else:
             raise TypeError("Unsupported operand type for +")
 
     def test(self) -> None:
         """Print color preview on console."""
-        print(f'\033[38;2;{self.red};{self.green};{self.blue}m' + self.to_hex() + '\033[0m')
+        print(self.fore_escape() + self.to_hex() + _reset_styles)
+
+    def fore_escape(self) -> str:
+        """Return the escape code setting this color as foreground, built once per object."""
+        try:
+            return self._fore_escape
+        except AttributeError:
+            object.__setattr__(self, '_fore_escape', f'\033[38;2;{self.red};{self.green};{self.blue}m')
+            return self._fore_escape
+
+    def back_escape(self) -> str:
+        """Return the escape code setting this color as background, built once per object."""
+        try:
+            return self._back_escape
+        except AttributeError:
+            object.__setattr__(self, '_back_escape', f'\033[48;2;{self.red};{self.green};{self.blue}m')
+            return self._back_escape
 
     def to_hex(self) -> str:
         """Convert RGB color to hexadecimal."""
@@ -71,7 +106,7 @@ class RGB:
 
     def to_dict(self) -> Dict:
         """Convert RGB color object to dictionary."""
-        return self.__dict__
+        return {'red': self.red, 'green': self.green, 'blue': self.blue}
 
     @classmethod
     def from_dict(self, data):
@@ -79,10 +114,60 @@ class RGB:
         return self(data['red'], data['green'], data['blue'])
 
 
+# Shared Ansi instances, safe to reuse because style objects are immutable
+_ansi_cache: Dict[Tuple, 'Ansi'] = {}
+_ansi_cache_limit = 1024
+
+
+def _ansi_key(cls: type, fore: Any, back: Any, *flags: Any) -> Union[Tuple, None]:
+    """
+    Build the key an Ansi instance is shared under in `_ansi_cache`.
+
+    Values that are equal but of different types (`1` and `True`, `255.0` and `255`) would share one
+    instance and leak their type into it, so only exact types are interned.
+
+    Returns:
+        - Union[Tuple, None]: The key, or None if the attributes are not exactly str/RGB of ints and bools.
+    """
+    for color in (fore, back):
+        if type(color) is RGB:
+            if not (type(color.red) is int and type(color.green) is int and type(color.blue) is int):
+                return None
+        elif type(color) is not str:
+            return None
+    for flag in flags:
+        if type(flag) is not bool:
+            return None
+    return (cls, fore, back) + flags
+
+
 @dataclass(init=False)
 class Ansi:
     """Class for creating ANSI escape codes."""
 
+    __slots__ = (
+        'fore', 'back', 'bold', 'dim', 'italic', 'underline', 'strikethrough', 'inverse', 'reset',
+        '_string', '_prefix', '_suffix',
+    )
+
+    def __new__(
+        cls,
+        fore: Union[_colors, RGB] = 'default',
+        back: Union[_colors, RGB] = 'default',
+        bold: bool = False,
+        dim: bool = False,
+        italic: bool = False,
+        underline: bool = False,
+        strikethrough: bool = False,
+        inverse: bool = False,
+        reset: bool = True,
+    ):
+        """Return the shared instance for these attributes, or a new one that __init__ will set up."""
+        key = _ansi_key(cls, fore, back, bold, dim, italic, underline, strikethrough, inverse, reset)
+        if key is not None and key in _ansi_cache:
+            return _ansi_cache[key]
+        return super().__new__(cls)
+
     def __init__(
         self,
         fore: Union[_colors, RGB] = 'default',
@@ -109,15 +194,45 @@ class Ansi:
             - `inverse` (bool): Flag for inverted text. (default is False)
             - `reset` (bool): Flag to reset formatting to default after text. (default is True)
         """
-        self.fore = fore
-        self.back = back
-        self.bold = bold
-        self.dim = dim
-        self.italic = italic
-        self.underline = underline
-        self.strikethrough = strikethrough
-        self.inverse = inverse
-        self.reset = reset
+        if hasattr(self, '_string'): # Shared instance returned from the cache, already initialized
+            return
+        # Style objects are immutable, so the fields are set past __setattr__
+        object.__setattr__(self, 'fore', fore)
+        object.__setattr__(self, 'back', back)
+        object.__setattr__(self, 'bold', bold)
+        object.__setattr__(self, 'dim', dim)
+        object.__setattr__(self, 'italic', italic)
+        object.__setattr__(self, 'underline', underline)
+        object.__setattr__(self, 'strikethrough', strikethrough)
+        object.__setattr__(self, 'inverse', inverse)
+        object.__setattr__(self, 'reset', reset)
+        string = self._build_string()
+        object.__setattr__(self, '_prefix', _reset_full + string)
+        object.__setattr__(self, '_suffix', _reset_full if reset else '')
+        object.__setattr__(self, '_string', string)
+
+        # Share the instance only now that it is fully built and can no longer change
+        if len(_ansi_cache) < _ansi_cache_limit:
+            key = _ansi_key(type(self), fore, back, bold, dim, italic, underline, strikethrough, inverse, reset)
+            if key is not None: # Only exact types are shared
+                _ansi_cache.setdefault(key, self)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if hasattr(self, '_string'):
+            raise FrozenInstanceError(f"cannot assign to field {name!r}, use the set_* methods to get a modified style object")
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name: str) -> None:
+        if hasattr(self, '_string'):
+            raise FrozenInstanceError(f"cannot delete field {name!r}")
+        object.__delattr__(self, name)
+
+    def __reduce__(self):
+        # Rebuild copies and pickles through the constructor so they go through the cache
+        return (type(self), (
+            self.fore, self.back, self.bold, self.dim, self.italic,
+            self.underline, self.strikethrough, self.inverse, self.reset,
+        ))
 
     def __str__(self) -> str:
         """Return the ANSI escape code string representation."""
@@ -127,21 +242,21 @@ class Ansi:
         if not isinstance(other, Ansi):
             return NotImplemented
         return (
-            self.fore == other.fore and
-            self.back == other.back and
-            self.bold == other.bold and
-            self.dim == other.dim and
-            self.italic == other.italic and
-            self.underline == other.underline and
-            self.strikethrough == other.strikethrough and
-            self.inverse == other.inverse and
-            self.reset == other.reset
+            (self.fore, self.back, self.bold, self.dim, self.italic,
+             self.underline, self.strikethrough, self.inverse, self.reset) ==
+            (other.fore, other.back, other.bold, other.dim, other.italic,
+             other.underline, other.strikethrough, other.inverse, other.reset)
         )
 
+    def __hash__(self) -> int:
+        return hash((
+            self.fore, self.back, self.bold, self.dim, self.italic,
+            self.underline, self.strikethrough, self.inverse, self.reset,
+        ))
+
     def __add__(self, other):
         if isinstance(other, str):
-            result = '\033[39;49;0m' + self.string + other + ('\033[39;49;0m' if self.reset else '')
-            return result
+            return self._prefix + other + self._suffix
         elif isinstance(other, Ansi):
             concat_ansi = Ansi(
                 fore=other.fore if self.fore == 'default' else self.fore,
@@ -159,8 +274,7 @@ class Ansi:
 
     def __radd__(self, other: str) -> str:
         if isinstance(other, str):
-            result = other + '\x1b[39;49;0m' + self.string
-            return result
+            return other + self._prefix
         else:
             raise TypeError(f"Unsupported operand type(s) for +: '{type(other)}' and 'Ansi'")
 
@@ -175,27 +289,33 @@ class Ansi:
         Returns:
             - (str): The concatenated result.
         """
-        val = [str(i) for i in values]
-        value = sep.join(val)
-        return self.string + value + '\033[39;49;0m'
+        if len(values) == 1:
+            value = str(values[0])
+        else:
+            value = sep.join(map(str, values))
+        return self._string + value + _reset_full
 
     @property
     def string(self) -> str:
         """
-        Property method that generates the ANSI escape code string based on the attribute values.
+        Property method that returns the ANSI escape code string based on the attribute values.
 
         Returns:
             - (str): The ANSI escape code string.
         """
+        return self._string
+
+    def _build_string(self) -> str:
+        """Generate the ANSI escape code string, called once when the style object is created."""
         if isinstance(self.fore, str): # Foreground color
-            fg = f'\033[{_ansi_codes[self.fore]}m'
+            fg = _fore_escapes[self.fore]
         else:
-            fg = f'\033[38;2;{self.fore.red};{self.fore.green};{self.fore.blue}m'
+            fg = self.fore.fore_escape()
 
         if isinstance(self.back, str): # Background color
-            bg = f'\033[{_ansi_codes[self.back] + 10}m'
+            bg = _back_escapes[self.back]
         else:
-            bg = f'\033[48;2;{self.back.red};{self.back.green};{self.back.blue}m'
+            bg = self.back.back_escape()
 
         b = ';1' if self.bold else '' # Bold
         d = ';2' if self.dim else '' # Dim
@@ -204,7 +324,7 @@ class Ansi:
         s = ';9' if self.strikethrough else '' # Strikethrough
         inv = ';7' if self.inverse else '' # Invert
 
-        styles = f'\033[0{b}{i}{u}{s}{d}{inv}m' if any([b, d, i, u, s, inv]) else '\033[0m' # Styles
+        styles = f'\033[0{b}{i}{u}{s}{d}{inv}m' if (self.bold or self.dim or self.italic or self.underline or self.strikethrough or self.inverse) else _reset_styles # Styles
 
         return styles + fg + bg
 
@@ -215,7 +335,7 @@ class Ansi:
         Parameters:
             - `text` (str): The text to format and print. (default is 'Hello World!').
         """
-        value = self.string + text + '\033[39;49;0m'
+        value = self.string + text + _reset_full
         print(value)
 
     def encode(self) -> bytes:
@@ -229,60 +349,63 @@ class Ansi:
 
     def set_fore(self, fore: Union[_colors, RGB]):
         """Set the foreground color and returns modified style object."""
-        new_style = copy(self)
-        new_style.fore = fore
-        return new_style
+        return self._replace(fore=fore)
 
     def set_back(self, back: Union[_colors, RGB]):
         """Set the background color and returns modified style object."""
-        new_style = copy(self)
-        new_style.back = back
-        return new_style
+        return self._replace(back=back)
 
     def set_bold(self, bold: bool):
         """Set the bold attribute and returns modified style object."""
-        new_style = copy(self)
-        new_style.bold = bold
-        return new_style
+        return self._replace(bold=bold)
 
     def set_dim(self, dim: bool):
         """Set the dim attribute and returns modified style object."""
-        new_style = copy(self)
-        new_style.dim = dim
-        return new_style
+        return self._replace(dim=dim)
 
     def set_italic(self, italic: bool):
         """Set the italic attribute and returns modified style object."""
-        new_style = copy(self)
-        new_style.italic = italic
-        return new_style
+        return self._replace(italic=italic)
 
     def set_underline(self, underline: bool):
         """Set the underline attribute and returns modified style object."""
-        new_style = copy(self)
-        new_style.underline = underline
-        return new_style
+        return self._replace(underline=underline)
 
     def set_strikethrough(self, strikethrough: bool):
         """Set the strikethrough attribute and returns modified style object."""
-        new_style = copy(self)
-        new_style.strikethrough = strikethrough
-        return new_style
+        return self._replace(strikethrough=strikethrough)
 
     def set_inverse(self, inverse: bool):
         """Set the inverse attribute and returns modified style object."""
-        new_style = copy(self)
-        new_style.inverse = inverse
-        return new_style
+        return self._replace(inverse=inverse)
+
+    def _replace(self, **changes):
+        """Return a new style object with the given attributes replaced."""
+        return type(self)(
+            fore=changes.get('fore', self.fore),
+            back=changes.get('back', self.back),
+            bold=changes.get('bold', self.bold),
+            dim=changes.get('dim', self.dim),
+            italic=changes.get('italic', self.italic),
+            underline=changes.get('underline', self.underline),
+            strikethrough=changes.get('strikethrough', self.strikethrough),
+            inverse=changes.get('inverse', self.inverse),
+            reset=changes.get('reset', self.reset),
+        )
 
     def to_dict(self) -> Dict:
         """Return a dictionary representation of the style object."""
-        new = deepcopy(self)
-        if isinstance(new.fore, RGB):
-            new.fore = new.fore.to_dict()
-        if isinstance(new.back, RGB):
-            new.back = new.back.to_dict()
-        return new.__dict__
+        return {
+            'fore': self.fore.to_dict() if isinstance(self.fore, RGB) else self.fore,
+            'back': self.back.to_dict() if isinstance(self.back, RGB) else self.back,
+            'bold': self.bold,
+            'dim': self.dim,
+            'italic': self.italic,
+            'underline': self.underline,
+            'strikethrough': self.strikethrough,
+            'inverse': self.inverse,
+            'reset': self.reset,
+        }
 
     @classmethod
     def from_dict(self, data: Dict):
@@ -306,6 +429,15 @@ class Ansi:
         )
 
 
+# Escape codes for the default single step cursor movements
+_move_left_1 = '\033[1D'
+_move_right_1 = '\033[1C'
+_move_up_1 = '\033[1A'
+_move_down_1 = '\033[1B'
+_scroll_up_1 = '\033[1T'
+_scroll_down_1 = '\033[1S'
+
+
 class Terminal:
     """
     A utility class for interacting with the terminal.
@@ -360,11 +492,23 @@ class Terminal:
         - `load() -> None`:
             Restores the previously saved position of the terminal cursor.
 
+        - `batch() -> ContextManager`:
+            Groups the writes made inside a `with` block and flushes them once at the end.
+
         - `fix_windows_console() -> None`:
             Enables ANSI escape code support in the Windows console.
             This function is specific to Windows and is automatically called if necessary.
     """
 
+    _batch_depth = 0
+
+    @staticmethod
+    def _write(code: str) -> None:
+        """Write `code` to stdout and flush it, unless a batch is open."""
+        sys.stdout.write(code)
+        if not Terminal._batch_depth:
+            sys.stdout.flush()
+
     @staticmethod
     def get_terminal_size() -> object:
         """Retrieve the size of the terminal window."""
@@ -374,92 +518,97 @@ class Terminal:
     @staticmethod
     def move_left(n: int = 1) -> None:
         """Move the cursor to the left by `n` characters."""
-        sys.stdout.write(f"\033[{n}D")
-        sys.stdout.flush()
+        Terminal._write(_move_left_1 if n == 1 else f"\033[{n}D")
 
     @staticmethod
     def move_right(n: int = 1) -> None:
         """Move the cursor to the right by `n` characters."""
-        sys.stdout.write(f"\033[{n}C")
-        sys.stdout.flush()
+        Terminal._write(_move_right_1 if n == 1 else f"\033[{n}C")
 
     @staticmethod
     def move_up(n: int = 1) -> None:
         """Move the cursor up by `n` lines."""
-        sys.stdout.write(f"\033[{n}A")
-        sys.stdout.flush()
+        Terminal._write(_move_up_1 if n == 1 else f"\033[{n}A")
 
     @staticmethod
     def move_down(n: int = 1) -> None:
         """Move the cursor down by `n` lines."""
-        sys.stdout.write(f"\033[{n}B")
-        sys.stdout.flush()
+        Terminal._write(_move_down_1 if n == 1 else f"\033[{n}B")
 
     @staticmethod
     def move_to(x: int, y: int) -> None:
         """Move the cursor to the specified position (`x`, `y`) in the terminal window."""
-        sys.stdout.write(f"\033[{y};{x}H")
-        sys.stdout.flush()
+        Terminal._write(f"\033[{y};{x}H")
 
     @staticmethod
     def hide() -> None:
         """Hide the terminal cursor."""
-        sys.stdout.write("\033[?25l")
-        sys.stdout.flush()
+        Terminal._write("\033[?25l")
 
     @staticmethod
     def show() -> None:
         """Show the terminal cursor."""
-        sys.stdout.write("\033[?25h")
-        sys.stdout.flush()
+        Terminal._write("\033[?25h")
 
     @staticmethod
     def move_line_beginning() -> None:
         """Move the cursor to the beginning of the current line."""
-        sys.stdout.write("\r")
-        sys.stdout.flush()
+        Terminal._write("\r")
 
     @staticmethod
     def clear() -> None:
         """Clear the entire terminal screen."""
-        sys.stdout.write("\033[2J\033[H")
-        sys.stdout.flush()
+        Terminal._write("\033[2J\033[H")
 
     @staticmethod
     def clear_line() -> None:
         """Clear the current line."""
-        sys.stdout.write("\r\033[K")
-        sys.stdout.flush()
+        Terminal._write("\r\033[K")
 
     @staticmethod
     def ding() -> None:
         """Produce a beep sound in the terminal."""
-        sys.stdout.write("\007")
-        sys.stdout.flush()
+        Terminal._write("\007")
 
     @staticmethod
     def scroll_up(n: int = 1) -> None:
         """Scroll the terminal window up by `n` lines."""
-        sys.stdout.write(f"\033[{n}T")
-        sys.stdout.flush()
+        Terminal._write(_scroll_up_1 if n == 1 else f"\033[{n}T")
 
     @staticmethod
     def scroll_down(n: int = 1) -> None:
         """Scroll the terminal window down by `n` lines."""
-        sys.stdout.write(f"\033[{n}S")
-        sys.stdout.flush()
+        Terminal._write(_scroll_down_1 if n == 1 else f"\033[{n}S")
 
     @staticmethod
     def save() -> None:
         """Save the current position of the terminal cursor."""
-        sys.stdout.write("\033[s")
-        sys.stdout.flush()
+        Terminal._write("\033[s")
 
     @staticmethod
     def load() -> None:
         """Restore the previously saved position of the terminal cursor."""
-        sys.stdout.write("\033[u")
-        sys.stdout.flush()
+        Terminal._write("\033[u")
+
+    @staticmethod
+    @contextmanager
+    def batch() -> Iterator[None]:
+        """
+        Group terminal writes and flush them once when the block exits.
+
+        Examples:
+            >>> with Terminal.batch():
+            ...     Terminal.save()
+            ...     Terminal.move_to(10, 5)
+            ...     Terminal.load()
+        """
+        Terminal._batch_depth += 1
+        try:
+            yield
+        finally:
+            Terminal._batch_depth -= 1
+            if not Terminal._batch_depth:
+                sys.stdout.flush()
 
     @staticmethod
     def fix_windows_console() -> None:
@@ -478,12 +627,20 @@ class Terminal:
 
 _modes = Literal["by letter", "by word", "by percent", "random"]
 
+# Accepted argument values, checked with a set lookup
+_mode_names = frozenset(get_args(_modes))
+_justify_names = frozenset({"left", "center", "right"})
+_target_names = frozenset({"fore", "back"})
+_pattern_properties = frozenset({"fore", "back", "bold", "dim", "italic", "underline", "strikethrough"})
+
+_ansi_escape = re.compile(r'\033(?:\[[0-?]*[ -/]*[@-~]|\][^\007\033]*(?:\007|\033\\))') # Any CSI or OSC sequence (ECMA-48)
+
 
 def remove_ansi(input_string: str) -> str:
     """Remove ANSI escape codes from an input string."""
-    import re
-    ansi_escape = re.compile(r'\033\[[0-9;]+m')
-    return ansi_escape.sub('', input_string)
+    if '\033' not in input_string:
+        return input_string
+    return _ansi_escape.sub('', input_string)
 
 def add(text: str, x: int = 0, y: int = 0) -> None:
     """
@@ -494,12 +651,12 @@ def add(text: str, x: int = 0, y: int = 0) -> None:
         - `y` (int): The y-coordinate on the terminal where the text will start.
         - `text` (str): The text to display at the specified coordinates. The text can contain multiple lines.
     """
-    Terminal.save()
-    Terminal.move_to(x, y)
+    parts = ['\033[s']
     for i, line in enumerate(text.split('\n')):
-        print(line, end='')
-        Terminal.move_to(x, y+i)
-    Terminal.load()
+        parts.append(f'\033[{y+i};{x}H')
+        parts.append(line)
+    parts.append('\033[u')
+    Terminal._write(''.join(parts))
 
 
 
@@ -560,35 +717,23 @@ def add(text: str, x: int = 0, y: int = 0) -> None:
 #         Returns:
 #             - str: The final styled result.
 #         """
-#         def l_getter(string: str):
-#             left = ""
-#             for char in string:
-#                 if char.isspace():
-#                     left += char
-#                 else:
-#                     return left
-
-#         def r_getter(string:str):
-#             right = ""
-#             for char in string[::-1]:
-#                 if char.isspace():
-#                     right += char
-#                 else:
-#                     return right[::-1]
-
 #         def add_pattern(text):
-#             length = len(self.pattern)
-#             new_text = ""
+#             pattern = self.pattern
+#             number = self.number
+#             offset = self.start
+#             length = len(pattern)
+#             parts = []
+#             append = parts.append
 #             wait = 0
 
 #             if self.mode == 'by letter':
-#                 for i, char in enumerate(text, self.start * self.number):
+#                 for i, char in enumerate(text, offset * number):
 #                     if char.isspace():
-#                         new_text += char
+#                         append(char)
 #                         wait += 1
 #                     else:
-#                         new_text += self.pattern[(i - wait) // self.number % length] + char
-#                 return new_text
+#                         append(pattern[(i - wait) // number % length] + char)
+#                 return "".join(parts)
 
 #             elif self.mode == 'by word':
 #                 new = []
@@ -602,22 +747,25 @@ def add(text: str, x: int = 0, y: int = 0) -> None:
 #                         new.append(text[start:i])
 #                         start = i
 
-#                 for i, char in enumerate(new, self.start * self.number):
+#                 for i, char in enumerate(new, offset * number):
 #                     if char.isspace():
-#                         new_text += char
+#                         append(char)
 #                         wait += 1
 #                     else:
-#                         new_text += self.pattern[(i - wait) // self.number % length] + char
-#                 return new_text
+#                         append(pattern[(i - wait) // number % length] + char)
+#                 return "".join(parts)
 
 #             elif self.mode == 'by percent':
-#                 length = length * self.number
+#                 length = length * number
 
 #                 constructed = []
 #                 for line in text.split("\n"):
-#                     left = l_getter(line) if l_getter(line) else ""
-#                     right = r_getter(line) if r_getter(line) else ""
 #                     sline = line.strip()
+#                     if sline: # Keep the surrounding whitespace out of the pattern
+#                         left = line[:len(line) - len(line.lstrip())]
+#                         right = line[len(line.rstrip()):]
+#                     else:
+#                         left = right = ""
 #                     text_len = len(sline) // length
 #                     form = [text_len for i in range(length)]
 
@@ -630,32 +778,32 @@ def add(text: str, x: int = 0, y: int = 0) -> None:
 #                         divided.append(sline[start:start+i])
 #                         start += i
 
-#                     new_text = ""
+#                     parts = []
+#                     append = parts.append
 #                     wait = 0
-#                     for i, frag in enumerate(divided, self.start):
+#                     for i, frag in enumerate(divided, offset):
 #                         if frag.isspace():
-#                             new_text += frag
+#                             append(frag)
 #                             wait += 1
 #                         else:
-#                             new_text += self.pattern[int((i - wait) % (length / self.number))] + frag
+#                             append(pattern[int((i - wait) % (length / number))] + frag)
 
-#                     new_text = left + new_text + right
-#                     constructed.append(new_text)
+#                     constructed.append(left + "".join(parts) + right)
 
 #                 return "\n".join(constructed)
 
 #             elif self.mode == 'random':
-#                 new_random = choice(self.pattern)
+#                 new_random = choice(pattern)
 
 #                 for i, char in enumerate(text):
-#                     if i % self.number == 0:
-#                         new_random = choice(self.pattern)
+#                     if i % number == 0:
+#                         new_random = choice(pattern)
 
 #                     if char.isspace():
-#                         new_text += char
+#                         append(char)
 #                     else:
-#                         new_text += new_random + char
-#                 return new_text
+#                         append(new_random + char)
+#                 return "".join(parts)
             
 #         def add_specials(text):
 #             result = text
@@ -803,7 +951,7 @@ def add(text: str, x: int = 0, y: int = 0) -> None:
 #                 - "by percent" - the text will be styled by percent of the text length.
 #                 - "random" - random style will be applied to each character.
 #         """
-#         if mode not in ["by letter", "by word", "by percent", "random"]:
+#         if mode not in _mode_names:
 #             raise ValueError(f"Mode must be {_modes}.")
 #         new_style = copy(self)
 #         new_style.mode = mode
@@ -857,7 +1005,7 @@ def add(text: str, x: int = 0, y: int = 0) -> None:
     
 #     def set_justify(self, justify: Literal["left", "center", "right"] | None):
 #         """ Justifies the output according to the parameter value. """
-#         if justify not in ["left", "center", "right"]:
+#         if justify not in _justify_names:
 #             raise ValueError('Justification must be either "left", "center", "right" or None.')
 #         new_style = copy(self)
 #         new_style.justify = justify
@@ -885,11 +1033,9 @@ def add(text: str, x: int = 0, y: int = 0) -> None:
 #             The property to set for each Ansi element in the pattern.
 #             - `value` (any): The value to set for the specified property.
 #         """
-#         new_pattern = []
-#         for ansi in self.pattern:
-#             new_ansi = copy(ansi)
-#             setattr(new_ansi, property, value)
-#             new_pattern.append(new_ansi)
+#         if property not in _pattern_properties:
+#             raise ValueError(f"Property must be one of {sorted(_pattern_properties)}.")
+#         new_pattern = [ansi._replace(**{property: value}) for ansi in self.pattern]
 
 #         new_style = copy(self)
 #         new_style.pattern = new_pattern
@@ -898,15 +1044,8 @@ def add(text: str, x: int = 0, y: int = 0) -> None:
 
 # def center(text: str):
 #     """Return the centered text."""
-#     from shutil import get_terminal_size
-
-#     console_width = get_terminal_size().columns
-
-#     centered = []
-#     for line in text.split("\n"):
-#         centered.append(f"{line: ^{console_width}}")
-
-#     return "\n".join(centered)
+#     spec = f"^{get_terminal_size().columns}"
+#     return "\n".join([format(line, spec) for line in text.split("\n")])
 
 
 # def reverse(text: str):
@@ -914,7 +1053,19 @@ def add(text: str, x: int = 0, y: int = 0) -> None:
 #     return text[::-1]
 
 
-def adv_gradient(colors: List[Tuple[RGB, int]], steps: int) -> List[RGB]:
+# Lookup tables for gradients blended in linear light instead of sRGB
+_linear_size = 4096
+_srgb_to_linear = [((v / 255 + 0.055) / 1.055) ** 2.4 if v > 10 else v / 255 / 12.92 for v in range(256)]
+_linear_to_srgb = [
+    round((1.055 * lin ** (1 / 2.4) - 0.055 if lin > 0.0031308 else 12.92 * lin) * 255)
+    for lin in (i / (_linear_size - 1) for i in range(_linear_size))
+]
+
+# Encoded decimal values of every channel, used to assemble escape codes as bytes
+_decimal_bytes = [str(value).encode() for value in range(256)]
+
+
+def adv_gradient(colors: List[Tuple[RGB, int]], steps: int, gamma_correct: bool = True) -> List[RGB]:
     """
     Generate advanced gradient.
 
@@ -924,73 +1075,157 @@ def adv_gradient(colors: List[Tuple[RGB, int]], steps: int) -> List[RGB]:
             - int: Number between 0 and 100 representing the color's percentage placement.
         - `steps` (int): How many ansi object in the list will be returned, the bigger.
           The larger the number, the more accurate but more complicated the gradient.
+        - `gamma_correct` (bool): Blend colors in linear light, which keeps the middle of the gradient
+          from getting darker. False blends the sRGB values directly. (default is True)
 
     Returns:
         - List[RGB]: List that can be converted to ansi pattern and then used as a pattern in style object.
 
+    Raises:
+        - ValueError: If a channel of any color is not an int between 0 and 255.
+
     Examples:
         >>> adv_gradient([(RGB(255, 0, 0), 10), (RGB(0, 255, 0), 30), (RGB(0, 0, 255), 70)], 100)
         # 0% - 10%: red, 10% - 30%: red-green, 30% - 70%: green-blue, 70% - 100%: blue
     """
-    sorted_cols = sorted(colors, key=lambda x: x[1]) # Sort colors by percentage
+    data = adv_gradient_array(colors, steps, gamma_correct)
+    return list(map(RGB, data[0::3], data[1::3], data[2::3]))
 
-    # Adding percentages marks
-    col_arr_perc = []
-    if not sorted_cols[0][1] == 0: # Add 0 at beginning if it's not there
-        col_arr_perc.append(0)
 
-    for i in sorted_cols:
-        col_arr_perc.append(i[1])
+def adv_gradient_array(colors: List[Tuple[RGB, int]], steps: int, gamma_correct: bool = True) -> bytearray:
+    """
+    Generate advanced gradient as raw channel values, same as `adv_gradient` but without creating RGB objects.
 
-    if not sorted_cols[-1][1] == 100: # Add 100 at beginning if it's not there
-        col_arr_perc.append(100)
+    Parameters:
+        - `colors` (List[RGB, int]): List of tuples, each tuple with 2 elements:
+            - RGB(): Color object.
+            - int: Number between 0 and 100 representing the color's percentage placement.
+        - `steps` (int): How many colors will be returned.
+        - `gamma_correct` (bool): Blend colors in linear light instead of sRGB. (default is True)
 
-    # Calculate percentage for each color
-    perc = []
-    for i, n in enumerate(col_arr_perc[1:], 1):
-          perc.append(n - col_arr_perc[i-1])
+    Returns:
+        - bytearray: Red, green and blue byte of every color one after another, 3 bytes per color.
 
-    # Calculate amount of steps for each color
-    steps_per = []
-    for i in perc:
-        steps_per.append(round((i / sum(perc)) * steps))
-    
-    del perc, col_arr_perc
-
-    # Create gradient based on its percentage
-    result = []
-    if not sorted_cols[0][1] == 0: # Add no-gradient color at the beginning if it was set
-        for _ in range(steps_per[0]):
-            result.append(sorted_cols[0][0])
-        steps_per.pop(0)
-    
-    if not sorted_cols[-1][1] == 100: # Delete the last index if its 100
-        last = steps_per.pop(-1)
+    Raises:
+        - ValueError: If a channel of any color is not an int between 0 and 255, as it could not be stored in a byte.
 
-    for i, steps in enumerate(steps_per): # Add gradient in the middle
-        result = result + gradient(sorted_cols[i][0], sorted_cols[i+1][0], steps)
+    Examples:
+        >>> data = adv_gradient_array([(RGB(255, 0, 0), 0), (RGB(0, 0, 255), 100)], 100)
+        >>> pixels = numpy.frombuffer(data, numpy.uint8).reshape(-1, 3) # (100, 3) array, no copy
+    """
+    for color, _ in colors:
+        _check_color(color)
+
+    sorted_cols = sorted(colors, key=lambda x: x[1]) # Sort colors by percentage
+
+    # Extend the first and last color to 0 and 100 percent if they are not there
+    stops = list(sorted_cols)
+    if stops[0][1] != 0:
+        stops.insert(0, (stops[0][0], 0))
+    if stops[-1][1] != 100:
+        stops.append((stops[-1][0], 100))
+
+    # Calculate amount of steps between each pair of neighbouring stops
+    perc = [stop[1] - prev[1] for prev, stop in zip(stops, stops[1:])]
+    total = Fraction(sum(perc)) # Exact, so float percentages still give int steps and fair remainders
+    steps_per, remainders = zip(*(divmod(Fraction(i) * steps, total) for i in perc))
+    steps_per = list(steps_per)
+
+    # Give the steps lost by rounding down to the stops with the largest remainders, so they add up to `steps`
+    by_remainder = sorted(range(len(perc)), key=lambda k: remainders[k], reverse=True)
+    for k in by_remainder[:steps - sum(steps_per)]:
+        steps_per[k] += 1
+
+    # Create gradient based on its percentage, channel by channel, into a preallocated buffer
+    data = bytearray(3 * sum(steps_per))
+    pos = 0
+    for (color1, _), (color2, _), segment_steps in zip(stops, stops[1:], steps_per):
+        if color1 == color2: # Extended ends and repeated colors have no gradient
+            reds, greens, blues = _flat_channels(color1, segment_steps)
+        else:
+            reds, greens, blues = _gradient_channels(
+                color1.red, color1.green, color1.blue,
+                color2.red, color2.green, color2.blue,
+                segment_steps, gamma_correct,
+            )
+        end = pos + 3 * segment_steps
+        data[pos:end:3], data[pos+1:end:3], data[pos+2:end:3] = reds, greens, blues
+        pos = end
+
+    return data
+
+
+def gradient(color1: RGB, color2: RGB, steps: int, gamma_correct: bool = True) -> List[RGB]:
+    """
+    Generate gradient, blended in linear light unless `gamma_correct` is False.
+    Raises ValueError if a channel of either color is not an int between 0 and 255.
+    """
+    _check_color(color1)
+    _check_color(color2)
+    reds, greens, blues = _gradient_channels(
+        color1.red, color1.green, color1.blue,
+        color2.red, color2.green, color2.blue,
+        steps, gamma_correct,
+    )
+    return list(map(RGB, reds, greens, blues))
+
+
+def _check_color(color: RGB) -> None:
+    """Raise ValueError unless every channel of `color` is an int between 0 and 255."""
+    for name in ('red', 'green', 'blue'):
+        value = getattr(color, name)
+        if not isinstance(value, int) or not 0 <= value <= 255:
+            raise ValueError(f"{name} channel of {color!r} must be an int between 0 and 255, got {value!r}.")
+
+
+def _gradient_channels(
+    red1: int, green1: int, blue1: int,
+    red2: int, green2: int, blue2: int,
+    steps: int,
+    gamma_correct: bool = True,
+) -> Tuple[List[int], List[int], List[int]]:
+    """Interpolate each channel between two colors."""
+    if steps < 2: # Nothing to interpolate
+        return ([red1], [green1], [blue1]) if steps == 1 else ([], [], [])
+
+    if gamma_correct:
+        fractions = _fractions(steps)
+        return (
+            _linear_channel(red1, red2, fractions),
+            _linear_channel(green1, green2, fractions),
+            _linear_channel(blue1, blue2, fractions),
+        )
 
-    if not sorted_cols[-1][1] == 100: # Add no-gradient color at the end if it was set
-        steps_per.append(last)
-        for _ in range(steps_per[-1]):
-            result.append(sorted_cols[-1][0])
+    # Integer floor division gives the same values as truncating the float result, without floats
+    last = steps - 1
+    d_red, d_green, d_blue = red2 - red1, green2 - green1, blue2 - blue1
+    return (
+        [red1 + d_red * step // last for step in range(steps)],
+        [green1 + d_green * step // last for step in range(steps)],
+        [blue1 + d_blue * step // last for step in range(steps)],
+    )
 
-    return result
 
+@lru_cache(maxsize=64)
+def _fractions(steps: int) -> Tuple[float, ...]:
+    """Return the position of every step between 0 and 1, shared by gradients of the same length."""
+    last = steps - 1
+    return tuple(step / last for step in range(steps))
 
-def gradient(color1: RGB, color2: RGB, steps: int) -> List[RGB]:
-    """Generate gradient."""
-    gradient_colors = []
 
-    for step in range(steps):
-        # Interpolate the RGB values for each step
-        r = int(color1.red + (color2.red - color1.red) * step / (steps - 1))
-        g = int(color1.green + (color2.green - color1.green) * step / (steps - 1))
-        b = int(color1.blue + (color2.blue - color1.blue) * step / (steps - 1))
+def _linear_channel(value1: int, value2: int, fractions: Tuple[float, ...]) -> List[int]:
+    """Interpolate one channel in linear light at the given fractions."""
+    start = _srgb_to_linear[value1]
+    scale = _linear_size - 1
+    start_index = start * scale + 0.5
+    delta = (_srgb_to_linear[value2] - start) * scale
+    to_srgb = _linear_to_srgb
+    return [to_srgb[int(start_index + delta * fraction)] for fraction in fractions]
 
-        gradient_colors.append(RGB(r, g, b))
 
-    return gradient_colors
+def _flat_channels(color: RGB, steps: int) -> Tuple[List[int], List[int], List[int]]:
+    """Repeat each channel of a single color `steps` times."""
+    return [color.red] * steps, [color.green] * steps, [color.blue] * steps
 
 
 def to_ansi(colors: List[RGB], target: Literal["fore", "back"] = "fore") -> List[Ansi]:
@@ -1008,13 +1243,102 @@ def to_ansi(colors: List[RGB], target: Literal["fore", "back"] = "fore") -> List
     Raises:
         - ValueError: If the target is not "fore" or "back".
     """
-    if target not in ["fore", "back"]:
+    if target not in _target_names:
         raise ValueError("target must be \"fore\" or \"back\".")
-    result = []
-    for color in colors:
-        if target == "fore":
-            result.append(Ansi(fore=color))
-        else:
-            result.append(Ansi(back=color))
+    if target == "fore":
+        return [Ansi(fore=color) for color in colors]
+    return [Ansi(back=color) for color in colors]
+
+
+def gradient_ansi(
+    color1: RGB,
+    color2: RGB,
+    steps: int,
+    target: Literal["fore", "back"] = "fore",
+    gamma_correct: bool = True,
+) -> List[Ansi]:
+    """
+    Generate gradient directly as a list of Ansi colors, same as `to_ansi(gradient(color1, color2, steps, gamma_correct), target)`.
+
+    Parameters:
+        - `color1` (RGB): Color at the beginning of the gradient.
+        - `color2` (RGB): Color at the end of the gradient.
+        - `steps` (int): How many Ansi objects will be returned.
+        - `target` (Literal["fore", "back"], optional): The target styling, either "fore" (foreground) or "back" (background).
+          Defaults to "fore".
+        - `gamma_correct` (bool): Blend colors in linear light instead of sRGB. (default is True)
 
-    return result
+    Returns:
+        - List[Ansi]: List of Ansi colors forming the gradient.
+
+    Raises:
+        - ValueError: If the target is not "fore" or "back".
+        - ValueError: If a channel of either color is not an int between 0 and 255.
+    """
+    if target not in _target_names:
+        raise ValueError("target must be \"fore\" or \"back\".")
+    _check_color(color1)
+    _check_color(color2)
+
+    reds, greens, blues = _gradient_channels(
+        color1.red, color1.green, color1.blue,
+        color2.red, color2.green, color2.blue,
+        steps, gamma_correct,
+    )
+    return [_ansi_for(r, g, b, target) for r, g, b in zip(reds, greens, blues)]
+
+
+@lru_cache(maxsize=4096)
+def _ansi_for(red: int, green: int, blue: int, target: str) -> Ansi:
+    """Return the Ansi color for the channel values, reused across gradients."""
+    if target == "fore":
+        return Ansi(fore=RGB(red, green, blue))
+    return Ansi(back=RGB(red, green, blue))
+
+
+def gradient_escape_bytes(
+    color1: RGB,
+    color2: RGB,
+    steps: int,
+    target: Literal["fore", "back"] = "fore",
+    gamma_correct: bool = True,
+) -> List[bytes]:
+    """
+    Generate gradient directly as encoded escape codes, without creating RGB or Ansi objects.
+
+    Parameters:
+        - `color1` (RGB): Color at the beginning of the gradient.
+        - `color2` (RGB): Color at the end of the gradient.
+        - `steps` (int): How many escape codes will be returned.
+        - `target` (Literal["fore", "back"], optional): The target styling, either "fore" (foreground) or "back" (background).
+          Defaults to "fore".
+        - `gamma_correct` (bool): Blend colors in linear light instead of sRGB. (default is True)
+
+    Returns:
+        - List[bytes]: One true color escape code per step, ready to be written between the encoded text.
+
+    Raises:
+        - ValueError: If the target is not "fore" or "back".
+        - ValueError: If a channel of either color is not an int between 0 and 255.
+
+    Examples:
+        >>> text = "Hello World!"
+        >>> codes = gradient_escape_bytes(RGB(255, 0, 0), RGB(0, 0, 255), len(text))
+        >>> sys.stdout.buffer.write(b"".join(code + char.encode() for code, char in zip(codes, text)) + b"\\033[0m")
+    """
+    if target not in _target_names:
+        raise ValueError("target must be \"fore\" or \"back\".")
+    _check_color(color1)
+    _check_color(color2)
+
+    reds, greens, blues = _gradient_channels(
+        color1.red, color1.green, color1.blue,
+        color2.red, color2.green, color2.blue,
+        steps, gamma_correct,
+    )
+    prefix = b'\033[38;2;' if target == "fore" else b'\033[48;2;'
+    decimal = _decimal_bytes
+    return [
+        b''.join((prefix, decimal[r], b';', decimal[g], b';', decimal[b], b'm'))
+        for r, g, b in zip(reds, greens, blues)
+    ]